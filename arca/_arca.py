@@ -19,6 +19,9 @@ BackendDefinitionType = Union[Callable, BaseBackend, str, NotSet]
 DepthDefinitionType = Optional[int]
 ReferenceDefinitionType = Optional[Union[Path, str]]
 
+# that should match valid git repos
+VALID_REPO_URL = re.compile(r"(https?|file)://[\w._\-/~]*[.git]?/?")
+
 
 class Arca:
     """ Basic interface for communicating with the library, most basic operations should be possible from this class.
@@ -138,8 +141,7 @@ class Arca:
 
         :raise ValueError: If the URL is not valid
         """
-        # that should match valid git repos
-        if not isinstance(repo, str) or not re.match(r"^(https?|file)://[\w._\-/~]*[.git]?/?$", repo):
+        if not isinstance(repo, str) or not VALID_REPO_URL.fullmatch(repo):
             raise ValueError(f"{repo} is not a valid http[s] or file:// git repository.")
 
     def repo_id(self, repo: str) -> str:
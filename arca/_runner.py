@@ -40,7 +40,7 @@ def run(filename):
         if not isinstance(args, list):
             raise ValueError("args is not a list")
 
-        if not isinstance(kwargs, dict) or not all([isinstance(x, str) for x in kwargs.keys()]):
+        if not isinstance(kwargs, dict) or not all(isinstance(x, str) for x in kwargs):
             raise ValueError("kwargs is not a valid kwargs dict")
 
     except (ValueError, KeyError, TypeError, AttributeError):
@@ -3,9 +3,13 @@ import re
 import subprocess
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Dict
+
+try:
+    from functools import cached_property
+except ImportError:  # Python < 3.8
+    from cached_property import cached_property
 
-from cached_property import cached_property
 from git import Repo
 
 import arca
@@ -48,10 +52,15 @@ class BaseBackend:
 
     def __init__(self, **settings):
         self._arca = None
+
+        #: Settings keys already computed by :meth:`get_settings_keys`
+        self._settings_keys: Dict[str, Tuple[str, str]] = {}
+
         for key, val in settings.items():
-            if hasattr(self, key) and isinstance(getattr(self, key), LazySettingProperty) and val is not NOT_SET:
-                if getattr(self, key).convert is not None:
-                    val = getattr(self, key).convert(val)
+            setting = getattr(type(self), key, None)
+            if isinstance(setting, LazySettingProperty) and val is not NOT_SET:
+                if setting.convert is not None:
+                    val = setting.convert(val)
                 setattr(self, key, val)
 
     def inject_arca(self, arca):
@@ -75,9 +84,14 @@ class BaseBackend:
     def get_settings_keys(self, key):
         """
         Parameters can be set through two settings keys, by a specific setting (eg. ``ARCA_DOCKER_BACKEND_KEY``)
-        or a general ``ARCA_BACKEND_KEY``. This function returns the two keys that can be used for this setting.
+        or a general ``ARCA_BACKEND_KEY``. This function returns the two keys that can be used for this setting,
+        the keys are cached per instance.
         """
-        return f"{self.snake_case_backend_name}_{key}", f"backend_{key}"
+        try:
+            return self._settings_keys[key]
+        except KeyError:
+            keys = self._settings_keys[key] = f"{self.snake_case_backend_name}_{key}", f"backend_{key}"
+            return keys
 
     def get_setting(self, key, default=NOT_SET):
         """ Gets a setting for the key.
@@ -92,9 +106,15 @@ class BaseBackend:
     def hash_file_contents(requirements_option: RequirementsOptions, path: Path) -> str:
         """ Returns a SHA256 hash of the contents of ``path`` combined with the Arca version.
         """
-        return hashlib.sha256(path.read_bytes() + bytes(
-            requirements_option.name + arca.__version__, "utf-8"
-        )).hexdigest()
+        hasher = hashlib.sha256()
+
+        with path.open("rb") as fl:
+            for chunk in iter(lambda: fl.read(65536), b""):
+                hasher.update(chunk)
+
+        hasher.update(bytes(requirements_option.name + arca.__version__, "utf-8"))
+
+        return hasher.hexdigest()
 
     def get_requirements_information(self, path: Path) -> Tuple[RequirementsOptions, Optional[str]]:
         """
@@ -6,6 +6,7 @@ import tarfile
 import time
 import re
 
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from pathlib import Path
 from typing import Optional, List, Tuple, Union, Callable
@@ -39,8 +40,14 @@ class DockerBackend(BaseBackend):
     * **inherit_image** - instead of using the default base Arca image, use this one
     * **use_registry_name** - use this registry to store images with requirements and dependencies
     * **registry_pull_only** - only use the registry to pull images, don't push updated
+
+    An existing :class:`DockerClient <docker.client.DockerClient>` can be passed as ``client``,
+    it's then used instead of creating a new connection to docker.
     """
 
+    #: Maximum number of containers killed at once in :meth:`stop_containers`
+    MAX_STOP_WORKERS = 8
+
     python_version = LazySettingProperty(default=None)
     keep_container_running = LazySettingProperty(default=False)
     apt_dependencies = LazySettingProperty(default=None)
@@ -74,7 +81,7 @@ class DockerBackend(BaseBackend):
         USER arca
     """
 
-    def __init__(self, **kwargs):
+    def __init__(self, client=None, **kwargs):
         """ Initializes the instance and checks that the docker package is installed.
         """
         super().__init__(**kwargs)
@@ -83,7 +90,7 @@ class DockerBackend(BaseBackend):
             raise ArcaMisconfigured(ArcaMisconfigured.PACKAGE_MISSING.format("docker"))
 
         self._containers = set()
-        self.client = None
+        self.client = client
         self.alpine_inherited = None
 
     def validate_configuration(self):
@@ -553,7 +560,7 @@ class DockerBackend(BaseBackend):
         # {"errorDetail": {"message":"<error_msg>"},"error":"<error_msg>"}
         # when the push is not successful
 
-        last_line = json.loads(result.split("\n")[-1])
+        last_line = json.loads(result.rpartition("\n")[2])
 
         if "error" in last_line:
             self.client.images.remove(f"{self.use_registry_name}:{image_tag}")
@@ -808,15 +815,22 @@ class DockerBackend(BaseBackend):
                 self._containers.add(container)
 
     def stop_containers(self):
-        """ Stops all containers used by this instance of the backend.
+        """ Stops all containers used by this instance of the backend, the containers are killed concurrently.
         """
-        while len(self._containers):
-            container = self._containers.pop()
+        containers, self._containers = self._containers, set()
+
+        if not containers:
+            return
+
+        def kill(container):
             try:
                 container.kill(signal.SIGKILL)
             except docker.errors.APIError:  # probably doesn't exist anymore
                 pass
 
+        with ThreadPoolExecutor(min(len(containers), self.MAX_STOP_WORKERS)) as executor:
+            list(executor.map(kill, containers))
+
     def get_install_requirements_dockerfile(self, name: str, tag: str, repo_path: Path,
                                             requirements_option: RequirementsOptions) -> str:
         """
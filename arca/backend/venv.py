@@ -1,14 +1,16 @@
 import shlex
 import shutil
 import subprocess
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict
+from uuid import uuid4
 from venv import EnvBuilder
 
 from git import Repo
 
 from arca.exceptions import BuildError, BuildTimeoutError
-from arca.utils import logger
+from arca.utils import logger, LazySettingProperty
 from .base import BaseRunInSubprocessBackend, RequirementsOptions
 
 
@@ -19,9 +21,22 @@ class VenvBackend(BaseRunInSubprocessBackend):
     If the target repository doesn't have requirements, it also uses a virtual environment, but just with
     no extra packages installed.
 
-    There are no extra settings for this backend.
+    Available settings:
+
+    * **fast_pip**: Install only wheels, without build isolation and without precompiling bytecode (default ``False``)
     """
 
+    #: pip options used when ``fast_pip`` is enabled, only suitable for requirements available as wheels
+    FAST_PIP_OPTIONS = ["--only-binary=:all:", "--no-build-isolation", "--no-compile"]
+
+    fast_pip = LazySettingProperty(default=False, convert=bool)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        #: Resolved paths to the Python executables of the virtualenvs used by this instance
+        self._python_paths: Dict[Path, str] = {}
+
     def get_virtualenv_path(self, requirements_option: RequirementsOptions, requirements_hash: Optional[str]) -> Path:
         """
         Returns the path to the virtualenv the current state of the repository.
@@ -33,6 +48,23 @@ class VenvBackend(BaseRunInSubprocessBackend):
 
         return Path(self._arca.base_dir) / "venvs" / venv_name
 
+    @staticmethod
+    def remove_broken_venv(venv_path: Path):
+        """
+        Removes a virtualenv in which the installation of requirements failed.
+        The folder is renamed first so a new virtualenv can be created in its place right away,
+        the actual deletion then runs in a background thread.
+        """
+        broken_path = venv_path.with_name(f"{venv_path.name}.broken.{uuid4().hex}")
+
+        try:
+            venv_path.rename(broken_path)
+        except OSError:
+            shutil.rmtree(str(venv_path), ignore_errors=True)
+            return
+
+        threading.Thread(target=shutil.rmtree, args=(str(broken_path), True), daemon=True).start()
+
     def get_or_create_venv(self, path: Path) -> Path:
         """
         Gets the location of  the virtualenv from :meth:`get_virtualenv_path`, checks if it exists already,
@@ -72,6 +104,9 @@ class VenvBackend(BaseRunInSubprocessBackend):
                 cmd = [str(venv_path / "bin" / "python3"), "-m", "pip", "install", "-r",
                        shlex.quote(str(requirements_file))]
 
+                if self.fast_pip:
+                    cmd += self.FAST_PIP_OPTIONS
+
             if cmd is not None:
                 logger.info("Running Popen cmd %s, with shell %s", cmd, shell)
 
@@ -86,7 +121,7 @@ class VenvBackend(BaseRunInSubprocessBackend):
                 except subprocess.TimeoutExpired:
                     process.kill()
                     logger.warning("The install command timed out, deleting the virtualenv")
-                    shutil.rmtree(str(venv_path), ignore_errors=True)
+                    self.remove_broken_venv(venv_path)
 
                     raise BuildTimeoutError(f"Installing of requirements timeouted after "
                                             f"{self.requirements_timeout} seconds.")
@@ -100,7 +135,7 @@ class VenvBackend(BaseRunInSubprocessBackend):
 
                 if process.returncode:
                     logger.warning("The install command failed, deleting the virtualenv")
-                    shutil.rmtree(str(venv_path), ignore_errors=True)
+                    self.remove_broken_venv(venv_path)
                     raise BuildError("Unable to install requirements.txt", extra_info={
                         "out_stream": out_stream,
                         "err_stream": err_stream,
@@ -117,4 +152,9 @@ class VenvBackend(BaseRunInSubprocessBackend):
     def get_or_create_environment(self, repo: str, branch: str, git_repo: Repo, repo_path: Path) -> str:
         """ Handles the requirements in the target repository, returns a path to a executable of the virtualenv.
         """
-        return str(self.get_or_create_venv(repo_path).resolve() / "bin" / "python")
+        venv_path = self.get_or_create_venv(repo_path)
+
+        if venv_path not in self._python_paths:
+            self._python_paths[venv_path] = str(venv_path.resolve() / "bin" / "python")
+
+        return self._python_paths[venv_path]
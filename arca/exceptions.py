@@ -35,6 +35,8 @@ class BuildError(ArcaException):
 
     def __str__(self):
         extra_info = self.extra_info
+        if extra_info is None:
+            return super().__str__()
         if isinstance(extra_info, dict) and "traceback" in extra_info:
             extra_info = extra_info["traceback"]
         return "{}\n\n{}".format(
@@ -59,6 +61,8 @@ class PushToRegistryError(ArcaException):
         self.full_output = full_output
 
     def __str__(self):
+        if self.full_output is None:
+            return super().__str__()
         return "{}\n\n{}".format(
             super().__str__(),
             self.full_output
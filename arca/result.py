@@ -1,27 +1,49 @@
 import json
 from typing import Dict, Any, Union
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from arca.exceptions import BuildError
 
 
+def loads(output: Union[str, bytes, bytearray]) -> Any:
+    """ Parses the output of the runner, using :mod:`orjson` if it's installed.
+
+    :raise ValueError: If the output isn't valid JSON.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(output)
+        except ValueError:  # json can parse NaN and Infinity produced by json.dumps in the runner
+            pass
+
+    return json.loads(output)
+
+
 class Result:
     """ For storing results of the tasks. So far only has one attribute, :attr:`output`.
     """
 
-    def __init__(self, result: Union[str, Dict[str, Any]]) -> None:
-        if isinstance(result, (str, bytes, bytearray)):
-            output = result
-            try:
-                result = json.loads(result)
-            except ValueError:
-                raise BuildError("The build failed (the output was corrupted, "
-                                 "possibly by the callable printing something)",
-                                 extra_info={
-                                     "output": output
-                                 })
-
-        if not isinstance(result, dict):
-            raise BuildError("The build failed (the value returned from the runner was not valid)")
+    __slots__ = ("output", "stdout", "stderr")
+
+    def __init__(self, result: Union[str, bytes, bytearray, Dict[str, Any]]) -> None:
+        if type(result) is not dict:  # a dict is passed directly when the runner is called in-process
+            if isinstance(result, (str, bytes, bytearray)):
+                output = result
+                try:
+                    result = loads(result)
+                except ValueError:
+                    raise BuildError("The build failed (the output was corrupted, "
+                                     "possibly by the callable printing something)",
+                                     extra_info={
+                                         "output": output
+                                     })
+
+            if not isinstance(result, dict):
+                raise BuildError("The build failed (the value returned from the runner was not valid)")
 
         if not result.get("success"):
             reason = "Task failed"
@@ -42,3 +64,11 @@ class Result:
 
         #: What the function wrote to stderr
         self.stderr = result.get("stderr")
+
+    def __getstate__(self):
+        # results are pickled by cache backends, some of them with protocols which don't support ``__slots__``
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
@@ -1,13 +1,25 @@
 import hashlib
 import json
+from functools import lru_cache
 from typing import Optional, Any, Dict, Iterable
 
-from cached_property import cached_property
+try:
+    from functools import cached_property
+except ImportError:  # Python < 3.8
+    from cached_property import cached_property
+
 from entrypoints import EntryPoint, BadEntryPoint
 
 from .exceptions import TaskMisconfigured
 
 
+@lru_cache(maxsize=128)
+def _parse_entry_point(entry_point: str) -> EntryPoint:
+    """ Tasks are usually created over and over with the same entry points, so the parsed ones are cached.
+    """
+    return EntryPoint.from_string(entry_point, "task")
+
+
 class Task:
     """ A class for defining tasks the run in the repositories. The task is defined by an entry point,
     timeout (5 seconds by default), arguments and keyword arguments.
@@ -37,7 +49,7 @@ class Task:
                  kwargs: Optional[Dict[str, Any]]=None) -> None:
 
         try:
-            self._entry_point = EntryPoint.from_string(entry_point, "task")
+            self._entry_point = _parse_entry_point(entry_point)
         except BadEntryPoint:
             raise TaskMisconfigured("Incorrectly defined entry point.")
 
@@ -53,12 +65,12 @@ class Task:
             raise TaskMisconfigured("Provided timeout could not be converted to int.")
 
         try:
-            self._args = list(args or [])
-            self._kwargs = dict(kwargs or {})
+            self._args = list(args) if args else []
+            self._kwargs = dict(kwargs) if kwargs else {}
         except (TypeError, ValueError):
             raise TaskMisconfigured("Provided arguments cannot be converted to list or dict.")
 
-        if not all([isinstance(x, str) for x in self._kwargs.keys()]):
+        if not all(isinstance(x, str) for x in self._kwargs):
             raise TaskMisconfigured("Keywords must be strings")
 
         try:
@@ -87,6 +99,8 @@ class Task:
 
     @cached_property
     def json(self):
+        """ The serialized Task, also used for computing :attr:`hash`, so the definition is only serialized once.
+        """
         return json.dumps(self.serialized)
 
     @cached_property
@@ -104,6 +118,6 @@ class Task:
 
     @cached_property
     def hash(self):
-        """ Returns a SHA1 hash of the Task for usage in cache keys.
+        """ Returns a SHA256 hash of the Task for usage in cache keys.
         """
-        return hashlib.sha256(bytes(self.json, "utf-8")).hexdigest()
+        return hashlib.sha256(self.json.encode("utf-8")).hexdigest()
@@ -1,20 +1,35 @@
 import importlib
 import logging
 import os
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, Callable, Union
-
-from git import Repo
+from typing import Any, Dict, Optional, Callable, Union, Tuple, TYPE_CHECKING
 
 from .exceptions import ArcaMisconfigured
 
+if TYPE_CHECKING:  # only used in annotations
+    from git import Repo  # noqa: F401
+
 
 class NotSet:
-    """ For default values which can't be ``None``.
+    """ For default values which can't be ``None``. There's only one instance, ``NOT_SET``.
     """
+    __slots__ = ()
+
+    _instance: Optional["NotSet"] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
     def __repr__(self):
         return "NOT_SET"
 
+    def __reduce__(self):
+        return "NOT_SET"
+
 
 NOT_SET = NotSet()
 
@@ -22,8 +37,9 @@ logger = logging.getLogger("arca")
 logger.setLevel(logging.DEBUG)
 
 
+@lru_cache(maxsize=None)
 def load_class(location: str) -> type:
-    """ Loads a class from a string and returns it.
+    """ Loads a class from a string and returns it. The loaded classes are cached.
 
     >>> from arca.utils import load_class
     >>> load_class("arca.backend.BaseBackend")
@@ -37,12 +53,15 @@ def load_class(location: str) -> type:
         raise ArcaMisconfigured(f"The module is not specified, can't load class from '{location}'")
 
     try:
-        imported_module = importlib.import_module(module_name)
+        try:
+            imported_module = sys.modules[module_name]
+        except KeyError:
+            imported_module = importlib.import_module(module_name)
         return getattr(imported_module, class_name)
-    except ModuleNotFoundError:
-        raise ArcaMisconfigured(f"{module_name} does not exist.")
-    except AttributeError:
-        raise ArcaMisconfigured(f"{module_name} does not have a {class_name} class")
+    except ModuleNotFoundError as e:
+        raise ArcaMisconfigured(f"{module_name} does not exist.") from e
+    except AttributeError as e:
+        raise ArcaMisconfigured(f"{module_name} does not have a {class_name} class") from e
 
 
 class LazySettingProperty:
@@ -65,6 +84,9 @@ class LazySettingProperty:
             self.key = name
 
     def __get__(self, instance, cls):
+        if instance is None:
+            return self
+
         try:
             result = instance.get_setting(self.key, self.default)
         except self.SettingsNotReady:
@@ -73,7 +95,7 @@ class LazySettingProperty:
         if self.convert is not None:
             result = self.convert(result)
 
-        setattr(instance, self.name, result)
+        instance.__dict__[self.name] = result
         return result
 
 
@@ -84,14 +106,29 @@ class Settings:
     PREFIX = "ARCA"
 
     def __init__(self, data: Optional[Dict[str, Any]]=None) -> None:
-        self._data = dict(data) if data else {}
+        self._data = {key.upper(): value for key, value in data.items()} if data else {}
 
-        for key, val in os.environ.items():
-            if key.startswith(Settings.PREFIX):
-                self.set(key, val)
+        #: Full keys for options already requested from this instance
+        self._keys: Dict[str, str] = {}
+        self._prefix = f"{self.PREFIX}_"
+
+        prefix = self.PREFIX
+        self._data.update((key.upper(), val) for key, val in os.environ.items() if key.startswith(prefix))
 
     def set(self, key, value):
-        self._data[key] = value
+        self._data[key.upper()] = value
+
+    def get_key(self, option: str) -> str:
+        """ Returns the full key for an option, the result is cached.
+
+        >>> Settings().get_key("base_dir")
+        'ARCA_BASE_DIR'
+        """
+        try:
+            return self._keys[option]
+        except KeyError:
+            key = self._keys[option] = self._prefix + option.upper()
+            return key
 
     def get(self, *keys: str, default: Any = NOT_SET) -> Any:
         """ Returns values from the settings in the order of keys, the first value encountered is used.
@@ -123,13 +160,16 @@ class Settings:
         :raise KeyError: If none of the keys are set and no default is provided.
 
         """
-        if not len(keys):
+        if not keys:
             raise ValueError("At least one key must be provided.")
 
+        data = self._data
+        get_key = self.get_key
+
         for option in keys:
-            key = f"{self.PREFIX}_{option.upper()}"
-            if key in self._data:
-                return self._data[key]
+            value = data.get(get_key(option), NOT_SET)
+            if value is not NOT_SET:
+                return value
 
         if default is NOT_SET:
             raise KeyError("None of the following key is present in settings and no default is set: {}".format(
@@ -139,23 +179,30 @@ class Settings:
         return default
 
 
-def is_dirty(repo: Repo) -> bool:
+def is_dirty(repo: "Repo") -> bool:
     """ Returns if the ``repo`` has been modified (including untracked files).
     """
     return repo.is_dirty(untracked_files=True)
 
 
-def get_last_commit_modifying_files(repo: Repo, *files) -> str:
+def get_last_commit_modifying_files(repo: "Repo", *files) -> str:
     """ Returns the hash of the last commit which modified some of the files (or files in those folders).
 
     :param repo: The repo to check in.
     :param files: List of files to check
     :return: Commit hash.
     """
-    return repo.git.log(*files, n=1, format="%H")
+    return repo.git.rev_list("-1", "HEAD", "--", *files)
+
+
+#: How many hashes :func:`get_hash_for_file` keeps before the cache is emptied
+FILE_HASHES_CACHE_SIZE = 1024
+
+# hashes of files in commits never change, so they can be cached by the commit hash
+_file_hashes: Dict[Tuple[str, str], str] = {}
 
 
-def get_hash_for_file(repo: Repo, path: Union[str, Path]) -> str:
+def get_hash_for_file(repo: "Repo", path: Union[str, Path]) -> str:
     """ Returns the hash for the specified path.
 
     Equivalent to ``git rev-parse HEAD:X``
@@ -164,4 +211,18 @@ def get_hash_for_file(repo: Repo, path: Union[str, Path]) -> str:
     :param path: The path to a file or folder to get hash for
     :return: The hash
     """
-    return repo.git.rev_parse(f"HEAD:{str(path)}")
+    try:
+        key = (repo.head.commit.hexsha, str(path))
+    except ValueError:  # no commits yet, let git raise its usual error
+        return repo.git.rev_parse(f"HEAD:{path}")
+
+    try:
+        return _file_hashes[key]
+    except KeyError:
+        pass
+
+    if len(_file_hashes) >= FILE_HASHES_CACHE_SIZE:
+        _file_hashes.clear()
+
+    file_hash = _file_hashes[key] = repo.git.rev_parse(f"HEAD:{key[1]}")
+    return file_hash
@@ -10,11 +10,13 @@ from utils import DeployDockerBasesCommand
 if sys.version_info < (3, 6):
     raise RuntimeError('Arca requires Python 3.6 or greater')
 
+HERE = Path(__file__).resolve().parent
+
 
 def long_description():
     return """{}\n\n{}""".format(
-        (Path(__file__).resolve().parent / "README.rst").read_text().split(".. split_here")[0],
-        (Path(__file__).resolve().parent / "docs/changes.rst").read_text()
+        (HERE / "README.rst").read_text().partition(".. split_here")[0],
+        (HERE / "docs/changes.rst").read_text()
     )
 
 
@@ -35,7 +37,7 @@ setup(
         "dogpile.cache~=0.9.0",
         "requests",
         "entrypoints>=0.2.3",
-        "cached-property",
+        "cached-property; python_version < '3.8'",
     ],
     extras_require={
         "docker": [
@@ -63,7 +65,7 @@ setup(
         "Topic :: Software Development :: Version Control :: Git"
     ],
     setup_requires=["pytest-runner"],
-    tests_require=["pytest", "pytest-flake8", "pytest-cov", "pytest-mock"],
+    tests_require=["pytest", "pytest-flake8", "pytest-cov", "pytest-mock", "pytest-xdist>=2.5"],
     cmdclass={
         "deploy_docker_bases": DeployDockerBasesCommand
     },
@@ -1,10 +1,40 @@
+import atexit
 import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from uuid import uuid4
 
+#: Minimal free space on ``/dev/shm`` for the test files to be put there, the venvs need a lot of space
+SHM_MIN_FREE_SPACE = 2 * 1024 ** 3
 
-if os.environ.get("TRAVIS", False):
-    BASE_DIR = "/home/travis/build/{}/test_loc".format(os.environ.get("TRAVIS_REPO_SLUG", "pyvec/arca"))
-else:
-    BASE_DIR = "/tmp/arca/test"
+
+def shm_available() -> bool:
+    """ Returns if ``/dev/shm`` (an in-memory filesystem) exists and has enough free space.
+        Can be disabled on machines with not enough memory by setting the ``ARCA_TEST_NO_TMPFS`` environment variable.
+    """
+    if os.environ.get("ARCA_TEST_NO_TMPFS"):
+        return False
+    try:
+        return shutil.disk_usage("/dev/shm").free >= SHM_MIN_FREE_SPACE
+    except OSError:
+        return False
+
+
+USE_SHM = shm_available()
+
+#: Folder for the temporary git repositories the tests commit to
+TEMP_DIR = "/dev/shm" if USE_SHM else tempfile.gettempdir()
+
+#: Arca folder for the tests, can be changed with the ``ARCA_TEST_BASE_DIR`` environment variable.
+#: Clones, venvs and cache files are written a lot, so it's kept in memory when possible.
+BASE_DIR = os.environ.get("ARCA_TEST_BASE_DIR") or str(Path(TEMP_DIR) / "arca" / "test")
+
+if os.environ.get("PYTEST_XDIST_WORKER"):  # each pytest-xdist worker gets its own Arca folder
+    BASE_DIR = os.path.join(BASE_DIR, os.environ["PYTEST_XDIST_WORKER"])
 
 
 RETURN_STR_FUNCTION = """
@@ -77,3 +107,77 @@ def func():
 
     return 1
 """
+
+
+def commit_files(repo, files, message):
+    """ Writes the ``files`` (a dict of paths and their contents, str or bytes) and commits them to ``repo``
+    in a single commit. Strings are written as UTF-8 regardless of the locale.
+    """
+    for path, content in files.items():
+        path.write_bytes(content if isinstance(content, bytes) else content.encode("utf-8"))
+
+    repo.index.add([str(path) for path in files])
+    return repo.index.commit(message)
+
+
+def commit_history(repo, path, contents, message):
+    """ Commits each of ``contents`` to the file at ``path`` as a separate commit on the active branch of ``repo``.
+
+    All the commits are imported in one ``git fast-import`` run instead of committing through the index one by one.
+    """
+    relative_path = Path(path).relative_to(repo.working_dir).as_posix()
+    ref = repo.head.ref.path
+
+    try:
+        parent = repo.head.commit.hexsha
+    except ValueError:  # no commits yet
+        parent = None
+
+    def data(content):
+        content = content.encode("utf-8")
+        return b"data %d\n%s\n" % (len(content), content)
+
+    stream = []
+    for content in contents:
+        stream.append(f"commit {ref}\ncommitter Arca Tests <arca@example.com> 0 +0000\n".encode("utf-8"))
+        stream.append(data(message))
+        if parent is not None:
+            stream.append(f"from {parent}\n".encode("utf-8"))
+            parent = None  # the following commits continue from the previous one in the stream
+        stream.append(f"M 100644 inline {relative_path}\n".encode("utf-8"))
+        stream.append(data(content))
+
+    subprocess.run(["git", "fast-import", "--quiet"], input=b"".join(stream), cwd=repo.working_dir, check=True)
+
+    repo.head.reset(index=True, working_tree=True)
+    return repo.head.commit
+
+
+_trash = queue.Queue()
+
+
+def _empty_trash():
+    while True:
+        path = _trash.get()
+        shutil.rmtree(path, ignore_errors=True)
+        _trash.task_done()
+
+
+threading.Thread(target=_empty_trash, daemon=True).start()
+atexit.register(_trash.join)  # don't leave the folders behind when the session ends
+
+
+def rmtree_later(path):
+    """ Removes the folder at ``path`` in a background thread, so the test doesn't wait for it.
+
+    The folder is renamed first, so the path is free to be used again right away.
+    """
+    path = Path(path)
+    trash_path = path.with_name(f"{path.name}.trash.{uuid4().hex}")
+
+    try:
+        path.rename(trash_path)
+    except OSError:
+        shutil.rmtree(str(path), ignore_errors=True)
+    else:
+        _trash.put(str(trash_path))
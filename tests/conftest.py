@@ -1,56 +1,191 @@
+import os
 import shutil
 import tempfile
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
+from typing import Iterator
 
 import pytest
 from collections import namedtuple
 
 from git import Repo
 
-from common import RETURN_STR_FUNCTION
+from arca import DockerBackend, VenvBackend
+
+from common import RETURN_STR_FUNCTION, TEMP_DIR, USE_SHM, commit_files, commit_history, rmtree_later
+
+
+#: ``--basetemp`` created for this session, pytest removes the contents of the folder at start,
+#: so it must not be shared with any other session running at the same time
+_session_basetemp = None
+
+
+@pytest.hookimpl(tryfirst=True)  # must run before pytest sets up ``tmp_path``, pytest-xdist passes it on to workers
+def pytest_configure(config):
+    global _session_basetemp
+
+    if USE_SHM and not config.option.basetemp:
+        _session_basetemp = tempfile.mkdtemp(prefix="arca-pytest-", dir=TEMP_DIR)
+        config.option.basetemp = _session_basetemp
+
+
+def pytest_unconfigure(config):
+    if _session_basetemp is not None:
+        rmtree_later(_session_basetemp)
+
+
+#: Backends which build environments (venvs, docker images) cached in the per-worker :data:`BASE_DIR`,
+#: their tests are kept on one pytest-xdist worker so each environment is built only once,
+#: tests which already are in a group (e.g. the ones changing the current interpreter's packages) keep it
+GROUPED_BACKENDS = (VenvBackend, DockerBackend)
+
+
+@pytest.hookimpl(tryfirst=True)  # before pytest-xdist turns the markers into node id suffixes
+def pytest_collection_modifyitems(items):
+    for item in items:
+        backend = item.callspec.params.get("backend") if hasattr(item, "callspec") else None
+
+        if item.get_closest_marker("xdist_group") is not None:
+            continue
+
+        if isinstance(backend, type) and issubclass(backend, GROUPED_BACKENDS):
+            item.add_marker(pytest.mark.xdist_group(backend.__name__))
+
 
 TempRepo = namedtuple("TempRepo", ["repo", "repo_path", "url", "branch", "file_path"])
 
 
-def create_temp_repo(file) -> TempRepo:
-    git_dir = Path(tempfile.mkdtemp())
-    repo = Repo.init(str(git_dir))
+@pytest.fixture(scope="session", autouse=True)
+def git_environment():
+    """ Isolates the git commands run by the tests from the system and user configuration
+    (e.g. ``init.defaultBranch``, the tests expect ``master``), doesn't let git wait for credentials
+    and skips the optional index refreshes of read-only commands.
+    """
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+        monkeypatch.setenv("GIT_CONFIG_GLOBAL", os.devnull)
+        monkeypatch.setenv("GIT_TERMINAL_PROMPT", "0")
+        monkeypatch.setenv("GIT_OPTIONAL_LOCKS", "0")
 
-    return TempRepo(
-        repo, git_dir, f"file://{git_dir}", "master", git_dir / file,
-    )
+        yield
 
 
-@pytest.fixture(params=["master", "branch/with/slash"])
-def temp_repo_func(request):
-    temp_repo = create_temp_repo("test_file.py")
+@pytest.fixture(scope="session")
+def git_template():
+    """ An empty initialized repository, copied by :func:`temp_repo_context` instead of running ``git init`` each time.
+    """
+    git_dir = Path(tempfile.mkdtemp(dir=TEMP_DIR))
+    Repo.init(str(git_dir))
+
+    # the sample hooks are never run, no need to copy them over and over
+    for sample_hook in (git_dir / ".git" / "hooks").glob("*.sample"):
+        sample_hook.unlink()
+
+    yield git_dir
+
+    rmtree_later(git_dir)
 
-    temp_repo.file_path.write_text(RETURN_STR_FUNCTION)
 
-    temp_repo.repo.index.add([str(temp_repo.file_path)])
-    temp_repo.repo.index.commit("Initial")
+def link_git_file(src, dst):
+    """ Copy function for the ``.git`` folders of the templates.
 
-    branch_name = request.param
-    if branch_name != "master":
-        # Now that there is a commit, create a branch
-        temp_repo = temp_repo._replace(branch=branch_name)
-        branch = temp_repo.repo.create_head(branch_name)
-        temp_repo.repo.head.reference = branch
+    Objects, refs and the index are replaced through lock files instead of being written into,
+    so the copies can share those files with the template.
+    The ``config`` (rewritten in place by GitPython's ``config_writer``) and the reflogs (appended to) are copied.
+    """
+    path = Path(src)
+    if path.name == "config" or "logs" in path.parts:
+        return shutil.copy2(src, dst)
+    return os.link(src, dst)
 
-    yield temp_repo
 
-    shutil.rmtree(str(temp_repo.repo_path))
+@contextmanager
+def temp_repo_context(template, file) -> Iterator[TempRepo]:
+    """ Creates a repository from the template, closes and removes it on exit even if the setup of a fixture fails.
+    """
+    git_dir = Path(tempfile.mkdtemp(dir=TEMP_DIR))
+
+    with ExitStack() as stack:
+        stack.callback(rmtree_later, git_dir)
+
+        try:
+            shutil.copytree(str(template / ".git"), str(git_dir / ".git"), copy_function=link_git_file)
+        except shutil.Error:
+            rmtree_later(git_dir / ".git")
+            shutil.copytree(str(template / ".git"), str(git_dir / ".git"))
+
+        # the tests write into the files in the working tree, those must be copied
+        for path in template.iterdir():
+            if path.name == ".git":
+                continue
+            if path.is_dir():
+                shutil.copytree(str(path), str(git_dir / path.name))
+            else:
+                shutil.copy2(str(path), str(git_dir / path.name))
+
+        repo = Repo(str(git_dir))
+        stack.callback(repo.close)  # releases the git processes and open files before the removal
+
+        yield TempRepo(
+            repo, git_dir, f"file://{git_dir}", "master", git_dir / file,
+        )
+
+
+@pytest.fixture(scope="session")
+def func_template(git_template):
+    """ A repository with :data:`RETURN_STR_FUNCTION` committed, copied by :func:`temp_repo_func`.
+    """
+    with temp_repo_context(git_template, "test_file.py") as temp_repo:
+        commit_files(temp_repo.repo, {temp_repo.file_path: RETURN_STR_FUNCTION}, "Initial")
+
+        yield temp_repo.repo_path
+
+
+@pytest.fixture(scope="session")
+def static_template(git_template):
+    """ A repository with a static text file committed, copied by :func:`temp_repo_static`.
+    """
+    with temp_repo_context(git_template, "test_file.txt") as temp_repo:
+        commit_files(temp_repo.repo, {temp_repo.file_path: "Some test file"}, "Initial")
+
+        yield temp_repo.repo_path
 
 
 @pytest.fixture()
-def temp_repo_static():
-    temp_repo = create_temp_repo("test_file.txt")
+def temp_repo_factory(git_template):
+    """ Returns a function creating empty repositories from the template, all of them are removed after the test.
+    """
+    with ExitStack() as stack:
+        def factory(file="test_file.txt") -> TempRepo:
+            return stack.enter_context(temp_repo_context(git_template, file))
+
+        yield factory
 
-    temp_repo.file_path.write_text("Some test file")
 
-    temp_repo.repo.index.add([str(temp_repo.file_path)])
-    temp_repo.repo.index.commit("Initial")
+@pytest.fixture(params=["master", "branch/with/slash"])
+def temp_repo_func(request, func_template):
+    with temp_repo_context(func_template, "test_file.py") as temp_repo:
+        branch_name = request.param
+        if branch_name != "master":
+            # Now that there is a commit, create a branch
+            temp_repo = temp_repo._replace(branch=branch_name)
+            branch = temp_repo.repo.create_head(branch_name)
+            temp_repo.repo.head.reference = branch
+
+        yield temp_repo
+
+
+@pytest.fixture()
+def temp_repo_static(static_template):
+    with temp_repo_context(static_template, "test_file.txt") as temp_repo:
+        yield temp_repo
+
 
-    yield temp_repo
+@pytest.fixture(scope="module")
+def shared_repo(git_template):
+    """ A repository with 20 commits, shared by the tests in a module which only pull from it.
+    """
+    with temp_repo_context(git_template, "test_file.txt") as temp_repo:
+        commit_history(temp_repo.repo, temp_repo.file_path, [f"Version {i}" for i in range(20)], "Initial")
 
-    shutil.rmtree(str(temp_repo.repo_path))
+        yield temp_repo
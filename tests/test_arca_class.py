@@ -1,66 +1,54 @@
 # encoding=utf-8
 import re
-import shutil
 from pathlib import Path
-from uuid import uuid4
 
 import pytest
 from git import Repo
 
 from arca import Arca, VenvBackend
 from arca.exceptions import ArcaMisconfigured, FileOutOfRangeError, PullError
-from common import BASE_DIR
+from common import BASE_DIR, commit_files, commit_history, rmtree_later
 
 
-def test_arca_backend():
-    assert isinstance(Arca(VenvBackend()).backend, VenvBackend)
-    assert isinstance(Arca(VenvBackend).backend, VenvBackend)
-    assert isinstance(Arca("arca.backend.VenvBackend").backend, VenvBackend)
-    assert isinstance(Arca(lambda: VenvBackend()).backend, VenvBackend)
+@pytest.mark.parametrize("backend", [
+    VenvBackend(),
+    VenvBackend,
+    "arca.backend.VenvBackend",
+    lambda: VenvBackend(),
+], ids=["instance", "class", "string", "callable"])
+def test_arca_backend(backend):
+    assert isinstance(Arca(backend).backend, VenvBackend)
 
-    with pytest.raises(ArcaMisconfigured):
-        Arca("arca.backend_test.TestBackend")
 
-    with pytest.raises(ArcaMisconfigured):
-        Arca("arca.backend.TestBackend")
+class NotASubclassClass:
+    pass
 
-    class NotASubclassClass:
-        pass
 
+@pytest.mark.parametrize("backend", [
+    "arca.backend_test.TestBackend",
+    "arca.backend.TestBackend",
+    NotASubclassClass,
+], ids=["nonexistent_module", "nonexistent_class", "not_a_subclass"])
+def test_arca_backend_misconfigured(backend):
     with pytest.raises(ArcaMisconfigured):
-        Arca(NotASubclassClass)
-
-
-@pytest.mark.parametrize(["url", "valid"], [
-    ("http://host.xz/path/to/repo.git/", True),
-    ("https://host.xz/path/to/repo.git/", True),
-    ("http://host.xz/path/to/repo.git", True),
-    ("https://host.xz/path/to/repo.git", True),
-    ("file:///path/to/repo.git/", True),
-    ("file://~/path/to/repo.git/", True),
-    ("http://host.xz/path/to/repo/", True),
-    ("https://host.xz/path/to/repo/", True),
-    ("http://host.xz/path/to/repo", True),
-    ("https://host.xz/path/to/repo", True),
-    ("file:///path/to/repo.git", True),
-    ("file://~/path/to/repo.git", True),
-    ("git://host.xz/path/to/repo.git/", False),
-    ("git://host.xz/~user/path/to/repo.git/", False),
-    ("ssh://host.xz/path/to/repo.git/", False),
-    (1, False),
-    (Repo(), False),
-])
-def test_validate_repo_url(url, valid):
-    arca = Arca()
+        Arca(backend)
 
-    if valid:
-        arca.validate_repo_url(url)
-    else:
-        with pytest.raises(ValueError):
-            arca.validate_repo_url(url)
+
+@pytest.fixture(scope="module")
+def arca_default():
+    """ A shared instance for the tests of methods which don't change the state of :class:`Arca`.
+    """
+    return Arca()
 
 
-@pytest.mark.parametrize("url", [
+@pytest.fixture(scope="module")
+def arca_base():
+    """ A shared instance for the tests pulling into :data:`BASE_DIR`, the repositories have unique URLs.
+    """
+    return Arca(base_dir=BASE_DIR)
+
+
+VALID_URLS = (
     "http://host.xz/path/to/repo.git/",
     "https://host.xz/path/to/repo.git/",
     "http://host.xz/path/to/repo.git",
@@ -73,32 +61,55 @@ def test_validate_repo_url(url, valid):
     "https://host.xz/path/to/repo",
     "file:///path/to/repo.git",
     "file://~/path/to/repo.git",
+)
+
+INVALID_URLS = (
+    "git://host.xz/path/to/repo.git/",
+    "git://host.xz/~user/path/to/repo.git/",
+    "ssh://host.xz/path/to/repo.git/",
+    1,
+    Repo(),
+)
+
+#: A valid folder name with only alphanumeric, dot or underscore characters
+VALID_REPO_ID = re.compile(r"[a-zA-Z0-9._]+")
+
+#: A valid URL nothing can be pulled from
+NONEXISTENT_REPO_URL = "file:///nonexistent/path/to/repo.git"
+
+
+@pytest.mark.xdist_group("arca_default")  # one worker runs the tests sharing the fixture, so it is created once
+@pytest.mark.parametrize(["url", "valid"], [(url, True) for url in VALID_URLS] + [(url, False) for url in INVALID_URLS])
+def test_validate_repo_url(arca_default, url, valid):
+    if valid:
+        arca_default.validate_repo_url(url)
+    else:
+        with pytest.raises(ValueError):
+            arca_default.validate_repo_url(url)
+
+
+@pytest.mark.xdist_group("arca_default")
+@pytest.mark.parametrize("url", VALID_URLS + (
     "https://host.xz/path/to/repo///with///a//lot/of/slashes/git/",
     "https://host.xz/path/to/repo_with   spaces.git/",
     "https://host.xz/path/to/repo_with_úňíčóďé_characters.git/",
-])
-def test_repo_id(url):
-    arca = Arca()
-
-    repo_id = arca.repo_id(url)
+))
+def test_repo_id(arca_default, url):
+    repo_id = arca_default.repo_id(url)
 
-    # it's a valid folder name with only alphanumeric, dot or underscore characters
-    assert re.match(r"^[a-zA-Z0-9._]+$", repo_id)
+    assert VALID_REPO_ID.fullmatch(repo_id)
 
 
-def test_repo_id_unique():
-    arca = Arca()
-
-    repo_id_1 = arca.repo_id("http://github.com/pyvec/naucse.python.cz")
-    repo_id_2 = arca.repo_id("http://github.com_pyvec_naucse.python.cz")
+@pytest.mark.xdist_group("arca_default")
+def test_repo_id_unique(arca_default):
+    repo_id_1 = arca_default.repo_id("http://github.com/pyvec/naucse.python.cz")
+    repo_id_2 = arca_default.repo_id("http://github.com_pyvec_naucse.python.cz")
 
     assert repo_id_1 != repo_id_2
 
 
 @pytest.mark.parametrize("file_location", ["", "test_location"])
-def test_static_files(temp_repo_static, file_location):
-    arca = Arca(base_dir=BASE_DIR)
-
+def test_static_files(arca_base, temp_repo_static, file_location):
     filepath = temp_repo_static.file_path
     if file_location:
         new_filepath = temp_repo_static.repo_path / file_location / "test_file.txt"
@@ -115,19 +126,19 @@ def test_static_files(temp_repo_static, file_location):
     relative_path = Path(file_location) / "test_file.txt"
     nonexistent_relative_path = Path(file_location) / "test_file2.txt"
 
-    result = arca.static_filename(temp_repo_static.url, temp_repo_static.branch, relative_path)
+    result = arca_base.static_filename(temp_repo_static.url, temp_repo_static.branch, relative_path)
 
-    assert filepath.read_text() == result.read_text()
+    assert filepath.read_bytes() == result.read_bytes()
 
-    result = arca.static_filename(temp_repo_static.url, temp_repo_static.branch, str(relative_path))
+    result = arca_base.static_filename(temp_repo_static.url, temp_repo_static.branch, str(relative_path))
 
-    assert filepath.read_text() == result.read_text()
+    assert filepath.read_bytes() == result.read_bytes()
 
     with pytest.raises(FileOutOfRangeError):
-        arca.static_filename(temp_repo_static.url, temp_repo_static.branch, "../file.txt")
+        arca_base.static_filename(temp_repo_static.url, temp_repo_static.branch, "../file.txt")
 
     with pytest.raises(FileNotFoundError):
-        arca.static_filename(temp_repo_static.url, temp_repo_static.branch, nonexistent_relative_path)
+        arca_base.static_filename(temp_repo_static.url, temp_repo_static.branch, nonexistent_relative_path)
 
 
 def test_current_git_hash(temp_repo_static):
@@ -155,238 +166,201 @@ def test_current_git_hash(temp_repo_static):
     assert short_hash == short_hash_single_pull
 
 
-def test_depth(temp_repo_static):
-    arca = Arca(base_dir=BASE_DIR)
+@pytest.mark.xdist_group("shared_repo")
+def test_depth_default(shared_repo, tmp_path):
+    arca = Arca(base_dir=tmp_path)
 
-    for _ in range(19):  # since one commit is made in the fixture
-        temp_repo_static.file_path.write_text(str(uuid4()))
-        temp_repo_static.repo.index.add([str(temp_repo_static.file_path)])
-        temp_repo_static.repo.index.commit("Initial")
+    # test that in default settings, only the last commit is pulled
+
+    cloned_repo, _ = arca.get_files(shared_repo.url, shared_repo.branch)
+    assert cloned_repo.commit().count() == 1
 
-    # test that in default settings, the whole repo is pulled in one go
 
-    cloned_repo, cloned_repo_path = arca.get_files(temp_repo_static.url, temp_repo_static.branch)
-    assert cloned_repo.commit().count() == 1  # default is 1
+@pytest.mark.xdist_group("shared_repo")
+@pytest.mark.parametrize("depth,expected_count", [
+    (1, 1),
+    (10, 10),
+    (100, 20),  # no fictional commits are included when the depth is bigger than the repo
+    (None, 20),  # no limit
+])
+def test_depth(shared_repo, tmp_path, depth, expected_count):
+    arca = Arca(base_dir=tmp_path)
 
-    # test when pulled again, the depth is increased since the local copy is stored
+    # the history is linear, so exactly the depth is pulled (more could be with merges etc)
 
-    temp_repo_static.file_path.write_text(str(uuid4()))
-    temp_repo_static.repo.index.add([str(temp_repo_static.file_path)])
-    temp_repo_static.repo.index.commit("Initial")
+    cloned_repo, _ = arca.get_files(shared_repo.url, shared_repo.branch, depth=depth)
+    assert cloned_repo.commit().count() == expected_count
 
-    cloned_repo, cloned_repo_path = arca.get_files(temp_repo_static.url, temp_repo_static.branch)
-    assert cloned_repo.commit().count() == 2
 
-    shutil.rmtree(str(cloned_repo_path))
+@pytest.mark.parametrize("depth", [1, 10])
+def test_depth_pull_again(temp_repo_static, tmp_path, depth):
+    arca = Arca(base_dir=tmp_path)
 
-    # test that when setting a certain depth, at least the depth is pulled (in case of merges etc)
+    # 19 since one commit is made in the fixture
+    commit_history(temp_repo_static.repo, temp_repo_static.file_path, [f"Version {i}" for i in range(19)], "Initial")
 
-    cloned_repo, cloned_repo_path = arca.get_files(temp_repo_static.url, temp_repo_static.branch, depth=10)
-    assert cloned_repo.commit().count() >= 10
+    cloned_repo, _ = arca.get_files(temp_repo_static.url, temp_repo_static.branch, depth=depth)
     before_second_pull = cloned_repo.commit().count()
 
-    # test when pulled again, the depth setting is ignored
+    # test when pulled again, the depth setting is ignored and the local copy is extended by the new commit
 
-    temp_repo_static.file_path.write_text(str(uuid4()))
-    temp_repo_static.repo.index.add([str(temp_repo_static.file_path)])
-    temp_repo_static.repo.index.commit("Initial")
+    commit_files(temp_repo_static.repo, {temp_repo_static.file_path: "Version 19"}, "Initial")
 
-    cloned_repo, cloned_repo_path = arca.get_files(temp_repo_static.url, temp_repo_static.branch)
+    cloned_repo, _ = arca.get_files(temp_repo_static.url, temp_repo_static.branch)
     assert cloned_repo.commit().count() == before_second_pull + 1
 
-    shutil.rmtree(str(cloned_repo_path))
-
-    # test when setting depth bigger than repo size, no fictional commits are included
-
-    cloned_repo, cloned_repo_path = arca.get_files(temp_repo_static.url, temp_repo_static.branch, depth=100)
-
-    assert cloned_repo.commit().count() == 22  # 20 plus the 2 extra commits
 
-    shutil.rmtree(str(cloned_repo_path))
-
-    # test no limit
-
-    cloned_repo, cloned_repo_path = arca.get_files(temp_repo_static.url, temp_repo_static.branch, depth=None)
-
-    assert cloned_repo.commit().count() == 22  # 20 plus the 2 extra commits
-
-
-@pytest.mark.parametrize("depth,valid", [
-    (1, True),
-    (5, True),
-    ("5", True),
-    (None, True),
-    ("asddf", False),
-    (-1, False),
-    (-2, False),
-    (0, False),
+@pytest.mark.xdist_group("arca_default")
+@pytest.mark.parametrize("depth,expected", [
+    (1, 1),
+    (5, 5),
+    ("5", 5),
+    (None, None),
+    ("asddf", ValueError),
+    (-1, ValueError),
+    (-2, ValueError),
+    (0, ValueError),
 ])
-def test_depth_validate(temp_repo_static, depth, valid):
-    arca = Arca(base_dir=BASE_DIR)
-
-    relative_path = Path("test_file.txt")
+def test_depth_validate(arca_default, depth, expected):
+    # the conversion is checked on the validator, no repository is needed
+    if expected is ValueError:
+        with pytest.raises(ValueError):
+            arca_default.validate_depth(depth)
 
-    if valid:
-        arca.static_filename(temp_repo_static.url, temp_repo_static.branch, relative_path, depth=depth)
-    else:
+        # static_filename validates before pulling, so only the rejection can be checked there without a repository
         with pytest.raises(ValueError):
-            arca.static_filename(temp_repo_static.url, temp_repo_static.branch, relative_path, depth=depth)
+            arca_default.static_filename(NONEXISTENT_REPO_URL, "master", "test_file.txt", depth=depth)
+    else:
+        assert arca_default.validate_depth(depth) == expected
 
 
-def test_reference():
-    arca = Arca(base_dir=BASE_DIR)
+@pytest.mark.xdist_group("shared_repo")
+def test_reference(arca_base, shared_repo, temp_repo_factory, tmp_path):
     branch = "master"
 
-    git_dir_1 = Path("/tmp/arca/") / str(uuid4())
-    git_url_1 = f"file://{git_dir_1}"
-    filepath_1 = git_dir_1 / "test_file.txt"
-    repo_1 = Repo.init(git_dir_1)
+    # only read from, the history of 20 commits can be shared with the depth tests
+    git_dir_1 = shared_repo.repo_path
+    git_url_1 = shared_repo.url
+    repo_1 = shared_repo.repo
 
-    last_uuid = None
-
-    for _ in range(20):
-        last_uuid = str(uuid4())
-        filepath_1.write_text(last_uuid)
-        repo_1.index.add([str(filepath_1)])
-        repo_1.index.commit("Initial")
+    last_content = shared_repo.file_path.read_text()
 
     # test nonexistent reference
 
-    cloned_repo, cloned_repo_path = arca.get_files(git_url_1, branch, reference=Path("/tmp/arca/") / str(uuid4()))
-    assert (cloned_repo_path / "test_file.txt").read_text() == last_uuid
-    shutil.rmtree(str(cloned_repo_path))
+    cloned_repo, cloned_repo_path = arca_base.get_files(git_url_1, branch, reference=tmp_path / "nonexistent")
+    assert (cloned_repo_path / "test_file.txt").read_text() == last_content
+    rmtree_later(cloned_repo_path)
 
     # test existing reference with no common commits
 
-    git_dir_2 = Path("/tmp/arca/") / str(uuid4())
-    filepath_2 = git_dir_2 / "test_file.txt"
-    repo_2 = Repo.init(git_dir_2)
+    temp_repo_2 = temp_repo_factory()
+    git_dir_2 = temp_repo_2.repo_path
+    filepath_2 = temp_repo_2.file_path
+    repo_2 = temp_repo_2.repo
 
-    for _ in range(20):
-        filepath_2.write_text(str(uuid4()))
-        repo_2.index.add([str(filepath_2)])
-        repo_2.index.commit("Initial")
+    # the contents differ from the shared repository, so they don't end up with the same commits
+    commit_history(repo_2, filepath_2, [f"Repo 2 version {i}" for i in range(20)], "Initial")
 
-    cloned_repo, cloned_repo_path = arca.get_files(git_url_1, branch, reference=git_dir_2)
-    assert (cloned_repo_path / "test_file.txt").read_text() == last_uuid
-    shutil.rmtree(str(cloned_repo_path))
+    cloned_repo, cloned_repo_path = arca_base.get_files(git_url_1, branch, reference=git_dir_2)
+    assert (cloned_repo_path / "test_file.txt").read_text() == last_content
+    rmtree_later(cloned_repo_path)
 
     # test existing reference with common commits
 
-    git_dir_3 = Path("/tmp/arca/") / str(uuid4())
+    git_dir_3 = tmp_path / "repo_3"
     git_url_3 = f"file://{git_dir_3}"
     filepath_3 = git_dir_3 / "test_file.txt"
-    repo_3 = repo_1.clone(str(git_dir_3))  # must pass string, fails otherwise
-
-    for _ in range(20):
-        last_uuid = str(uuid4())
-        filepath_3.write_text(last_uuid)
-        repo_3.index.add([str(filepath_3)])
-        repo_3.index.commit("Initial")
-
-    cloned_repo, cloned_repo_path = arca.get_files(git_url_3, branch, reference=git_dir_1)
-    assert (cloned_repo_path / "test_file.txt").read_text() == last_uuid
-
-
-@pytest.mark.parametrize("reference,valid", [
-    ("/tmp/" + str(uuid4()), True),
-    (b"/tmp/" + str(uuid4()).encode("utf-8"), True),
-    (Path("/tmp/") / str(uuid4()), True),
-    (None, True),
-    (1, False)
-])
-def test_reference_validate(temp_repo_static, reference, valid):
-    arca = Arca(base_dir=BASE_DIR)
-
-    relative_path = Path("test_file.txt")
+    # borrows the objects of repo_1 instead of copying them, repo_1 exists until the end of the test
+    repo_3 = repo_1.clone(str(git_dir_3), multi_options=["--shared"])  # must pass string, fails otherwise
+
+    contents = [f"Repo 3 version {i}" for i in range(20)]
+    last_content = contents[-1]
+    commit_history(repo_3, filepath_3, contents, "Initial")
+
+    cloned_repo, cloned_repo_path = arca_base.get_files(git_url_3, branch, reference=git_dir_1)
+    assert (cloned_repo_path / "test_file.txt").read_text() == last_content
+
+
+@pytest.mark.xdist_group("arca_default")
+@pytest.mark.parametrize("reference,expected", [
+    ("/tmp/reference", Path("/tmp/reference")),
+    (b"/tmp/reference", Path("/tmp/reference")),
+    (Path("/tmp/reference"), Path("/tmp/reference")),
+    (None, None),
+    (1, ValueError)
+], ids=["str", "bytes", "path", "none", "int"])
+def test_reference_validate(arca_default, reference, expected):
+    # the conversion is checked on the validator, no repository is needed
+    if expected is ValueError:
+        with pytest.raises(ValueError):
+            arca_default.validate_reference(reference)
 
-    if valid:
-        arca.static_filename(temp_repo_static.url, temp_repo_static.branch, relative_path, reference=reference)
-    else:
+        # static_filename validates before pulling, so only the rejection can be checked there without a repository
         with pytest.raises(ValueError):
-            arca.static_filename(temp_repo_static.url, temp_repo_static.branch, relative_path, reference=reference)
+            arca_default.static_filename(NONEXISTENT_REPO_URL, "master", "test_file.txt", reference=reference)
+    else:
+        assert arca_default.validate_reference(reference) == expected
 
 
-def test_get_reference_repository(temp_repo_static):
+def test_get_reference_repository(arca_base, temp_repo_static):
     """
     Test that the :meth:`Arca.get_reference_repository` works when reference is not provided by the user
     or when branch `master` is not pulled first (as it is in other tests).
     """
-    temp_repo_static.file_path.write_text("master")
-    temp_repo_static.repo.index.add([str(temp_repo_static.file_path)])
-    temp_repo_static.repo.index.commit("Initial")
+    commit_files(temp_repo_static.repo, {temp_repo_static.file_path: "master"}, "Initial")
 
     for branch in "branch1", "branch2", "branch3":
         temp_repo_static.repo.create_head(branch)
         temp_repo_static.repo.branches[branch].checkout()
-        temp_repo_static.file_path.write_text(branch)
-        temp_repo_static.repo.index.add([str(temp_repo_static.file_path)])
-        temp_repo_static.repo.index.commit(branch)
-
-    arca = Arca(base_dir=BASE_DIR)
+        commit_files(temp_repo_static.repo, {temp_repo_static.file_path: branch}, branch)
 
     for branch in "branch1", "branch2", "master", "branch3":
-        _, path = arca.get_files(temp_repo_static.url, branch)
+        _, path = arca_base.get_files(temp_repo_static.url, branch)
 
         assert (path / temp_repo_static.file_path.name).read_text() == branch
 
 
-def test_pull_error():
-    arca = Arca(base_dir=BASE_DIR)
-
-    git_dir = Path("/tmp/arca/") / str(uuid4())
-    git_url = f"file://{git_dir}"
+def test_pull_error(arca_base, temp_repo_factory, tmp_path):
+    git_url = f"file://{tmp_path / 'nonexistent'}"
 
     with pytest.raises(PullError):
-        arca.get_files(git_url, "master")
+        arca_base.get_files(git_url, "master")
 
-    filepath = git_dir / "test_file.txt"
-    repo = Repo.init(git_dir)
-    filepath.write_text(str(uuid4()))
-    repo.index.add([str(filepath)])
-    repo.index.commit("Initial")
+    temp_repo = temp_repo_factory()
+    commit_files(temp_repo.repo, {temp_repo.file_path: "Version 0"}, "Initial")
 
-    arca.get_files(git_url, "master")
+    arca_base.get_files(temp_repo.url, "master")
 
     with pytest.raises(PullError):
-        arca.get_files(git_url, "some_branch")
+        arca_base.get_files(temp_repo.url, "some_branch")
 
-    shutil.rmtree(str(git_dir))
+    rmtree_later(temp_repo.repo_path)
 
     with pytest.raises(PullError):
-        arca.get_files(git_url, "master")
+        arca_base.get_files(temp_repo.url, "master")
 
 
-def test_get_repo(temp_repo_static):
-    arca = Arca(base_dir=BASE_DIR)
-
-    pulled_repo = arca.get_repo(temp_repo_static.url, temp_repo_static.branch)
+def test_get_repo(arca_base, temp_repo_static):
+    pulled_repo = arca_base.get_repo(temp_repo_static.url, temp_repo_static.branch)
 
     assert pulled_repo.head.object.hexsha == temp_repo_static.repo.head.object.hexsha
 
 
-def test_fetch_and_reset(temp_repo_static):
+def test_fetch_and_reset(arca_base, temp_repo_static):
     """
     Tests updating already cloned repo, which was rebased.
     Prevents ``fatal: refusing to merge unrelated histories``.
     """
-    arca = Arca(base_dir=BASE_DIR)
-
-    initial_value = str(uuid4())
-    temp_repo_static.file_path.write_text(initial_value)
-    temp_repo_static.repo.index.add([str(temp_repo_static.file_path)])
-    temp_repo_static.repo.index.commit("Update")
+    initial_value = "Initial version"
+    commit_files(temp_repo_static.repo, {temp_repo_static.file_path: initial_value}, "Update")
     initial_commit = temp_repo_static.repo.head.object.hexsha
 
-    for _ in range(5):
-        temp_repo_static.file_path.write_text(str(uuid4()))
-        temp_repo_static.repo.index.add([str(temp_repo_static.file_path)])
-        temp_repo_static.repo.index.commit("Update")
+    commit_history(temp_repo_static.repo, temp_repo_static.file_path, [f"Version {i}" for i in range(5)], "Update")
 
-    arca.get_files(temp_repo_static.url, temp_repo_static.branch)
+    arca_base.get_files(temp_repo_static.url, temp_repo_static.branch)
 
     temp_repo_static.repo.head.reset(initial_commit)
 
-    _, path_to_cloned = arca.get_files(temp_repo_static.url, temp_repo_static.branch)
+    _, path_to_cloned = arca_base.get_files(temp_repo_static.url, temp_repo_static.branch)
 
     assert (path_to_cloned / temp_repo_static.file_path.name).read_text() == initial_value
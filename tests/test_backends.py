@@ -1,15 +1,18 @@
 import itertools
 import os
+import time
 from pathlib import Path
 
 import pytest
 
 from arca import Arca, VenvBackend, DockerBackend, Task, CurrentEnvironmentBackend
+from arca.backend.base import RequirementsOptions
 from arca.exceptions import BuildTimeoutError, BuildError
 from common import BASE_DIR, RETURN_COLORAMA_VERSION_FUNCTION, SECOND_RETURN_STR_FUNCTION, \
-    TEST_UNICODE, ARG_STR_FUNCTION, KWARG_STR_FUNCTION, WAITING_FUNCTION, RETURN_STR_FUNCTION
+    TEST_UNICODE, ARG_STR_FUNCTION, KWARG_STR_FUNCTION, WAITING_FUNCTION, RETURN_STR_FUNCTION, commit_files
 
 
+@pytest.mark.xdist_group("current_environment")  # checks colorama isn't installed in the current interpreter
 @pytest.mark.parametrize(
     ["backend", "requirements_location", "file_location"], list(itertools.product(
         (VenvBackend, DockerBackend),
@@ -36,7 +39,7 @@ def test_backends(temp_repo_func, backend, requirements_location, file_location)
     if backend == DockerBackend:
         kwargs["disable_pull"] = True
 
-    backend = backend(verbosity=2, **kwargs)
+    backend = backend(**kwargs)
 
     arca = Arca(backend=backend, base_dir=BASE_DIR)
 
@@ -81,10 +84,7 @@ def test_backends(temp_repo_func, backend, requirements_location, file_location)
 
     assert arca.run(temp_repo_func.url, temp_repo_func.branch, task).output == "0.3.9"
 
-    requirements_path.write_text("colorama==0.3.8")
-
-    temp_repo_func.repo.index.add([str(requirements_path)])
-    temp_repo_func.repo.index.commit("Updated requirements")
+    commit_files(temp_repo_func.repo, {requirements_path: "colorama==0.3.8"}, "Updated requirements")
 
     assert arca.run(temp_repo_func.url, temp_repo_func.branch, task).output == "0.3.8"
 
@@ -111,22 +111,18 @@ def test_backends(temp_repo_func, backend, requirements_location, file_location)
     with pytest.raises(BuildError):  # Only Pipfile.lock
         arca.run(temp_repo_func.url, temp_repo_func.branch, task)
 
-    pipfile_path.write_text((Path(__file__).parent / "fixtures/Pipfile").read_text("utf-8"))
-
-    temp_repo_func.repo.index.add([str(pipfile_path)])
-    temp_repo_func.repo.index.commit("Added back Pipfile")
+    commit_files(temp_repo_func.repo, {
+        pipfile_path: (Path(__file__).parent / "fixtures/Pipfile").read_text("utf-8")
+    }, "Added back Pipfile")
 
     # works even when requirements is in the repo
-    requirements_path.write_text("colorama==0.3.8")
-    temp_repo_func.repo.index.add([str(requirements_path)])
-    temp_repo_func.repo.index.commit("Added back requirements")
+    commit_files(temp_repo_func.repo, {requirements_path: "colorama==0.3.8"}, "Added back requirements")
 
     assert arca.run(temp_repo_func.url, temp_repo_func.branch, task).output == "0.3.9"
 
-    pipfile_lock_path.write_text((Path(__file__).parent / "fixtures/Pipfile.lock.invalid").read_text("utf-8"))
-
-    temp_repo_func.repo.index.add([str(pipfile_lock_path)])
-    temp_repo_func.repo.index.commit("Broke Pipfile.lock")
+    commit_files(temp_repo_func.repo, {
+        pipfile_lock_path: (Path(__file__).parent / "fixtures/Pipfile.lock.invalid").read_text("utf-8")
+    }, "Broke Pipfile.lock")
 
     with pytest.raises(BuildError):  # Invalid Pipfile.lock
         arca.run(temp_repo_func.url, temp_repo_func.branch, task)
@@ -156,25 +152,21 @@ def test_advanced_backends(temp_repo_func, backend):
         kwargs["current_environment_requirements"] = None
         kwargs["requirements_strategy"] = "install_extra"
 
-    backend = backend(verbosity=2, **kwargs)
+    backend = backend(**kwargs)
 
     arca = Arca(backend=backend, base_dir=BASE_DIR)
 
     filepath = temp_repo_func.file_path
     requirements_path = temp_repo_func.repo_path / backend.requirements_location
 
-    filepath.write_text(ARG_STR_FUNCTION)
-    temp_repo_func.repo.index.add([str(filepath)])
-    temp_repo_func.repo.index.commit("Argument function")
+    commit_files(temp_repo_func.repo, {filepath: ARG_STR_FUNCTION}, "Argument function")
 
     assert arca.run(temp_repo_func.url, temp_repo_func.branch, Task(
         "test_file:return_str_function",
         args=[TEST_UNICODE]
     )).output == TEST_UNICODE[::-1]
 
-    filepath.write_text(KWARG_STR_FUNCTION)
-    temp_repo_func.repo.index.add([str(filepath)])
-    temp_repo_func.repo.index.commit("Keyword argument function")
+    commit_files(temp_repo_func.repo, {filepath: KWARG_STR_FUNCTION}, "Keyword argument function")
 
     assert arca.run(temp_repo_func.url, temp_repo_func.branch, Task(
         "test_file:return_str_function",
@@ -182,9 +174,7 @@ def test_advanced_backends(temp_repo_func, backend):
     )).output == TEST_UNICODE[::-1]
 
     # test task timeout
-    filepath.write_text(WAITING_FUNCTION)
-    temp_repo_func.repo.index.add([str(filepath)])
-    temp_repo_func.repo.index.commit("Waiting function")
+    commit_files(temp_repo_func.repo, {filepath: WAITING_FUNCTION}, "Waiting function")
 
     task_1_second = Task("test_file:return_str_function", timeout=1)
     task_3_seconds = Task("test_file:return_str_function", timeout=3)
@@ -210,3 +200,53 @@ def test_advanced_backends(temp_repo_func, backend):
 
     with pytest.raises(BuildTimeoutError):
         arca.run(temp_repo_func.url, temp_repo_func.branch, Task("test_file:return_str_function"))
+
+
+@pytest.mark.parametrize("rename_fails", [False, True], ids=["background", "fallback"])
+def test_remove_broken_venv(mocker, tmp_path, rename_fails):
+    venv_path = tmp_path / "venvs" / "hash"
+    (venv_path / "bin").mkdir(parents=True)
+    (venv_path / "bin" / "python").write_text("")
+
+    if rename_fails:  # the venv is removed right away instead
+        mocker.patch.object(Path, "rename", side_effect=OSError)
+
+    VenvBackend.remove_broken_venv(venv_path)
+
+    assert not venv_path.exists()
+
+    # the renamed folder is deleted in a background thread
+    for _ in range(50):
+        if not list(venv_path.parent.iterdir()):
+            break
+        time.sleep(0.1)
+    else:
+        pytest.fail("The broken venv wasn't deleted")
+
+
+@pytest.mark.parametrize(["kwargs", "fast_pip"], [
+    ({}, False),
+    ({"fast_pip": False}, False),
+    ({"fast_pip": True}, True),
+], ids=["default", "disabled", "enabled"])
+def test_fast_pip(mocker, tmp_path, kwargs, fast_pip):
+    backend = VenvBackend(**kwargs)
+    Arca(backend=backend, base_dir=str(tmp_path))
+
+    # no venv is actually created and nothing is installed, only the pip command is checked
+    mocker.patch("arca.backend.venv.EnvBuilder")
+    mocker.patch.object(backend, "get_requirements_information",
+                        return_value=(RequirementsOptions.requirements_txt, "hash"))
+    popen = mocker.patch("arca.backend.venv.subprocess.Popen")
+    popen.return_value.communicate.return_value = (b"", b"")
+    popen.return_value.returncode = 0
+
+    (tmp_path / backend.requirements_location).write_text("colorama==0.3.9")
+
+    backend.get_or_create_venv(tmp_path)
+
+    cmd = popen.call_args[0][0]
+    assert cmd[1:4] == ["-m", "pip", "install"]
+
+    for option in VenvBackend.FAST_PIP_OPTIONS:
+        assert (option in cmd) is fast_pip
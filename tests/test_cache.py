@@ -17,7 +17,7 @@ from common import BASE_DIR, RETURN_COLORAMA_VERSION_FUNCTION
 def test_cache(mocker, temp_repo_func, cache_backend, arguments):
     base_dir = Path(BASE_DIR)
 
-    backend = VenvBackend(verbosity=2)
+    backend = VenvBackend()
 
     base_dir.mkdir(parents=True, exist_ok=True)
 
@@ -31,10 +31,9 @@ def test_cache(mocker, temp_repo_func, cache_backend, arguments):
 
     requirements_path = temp_repo_func.repo_path / "requirements.txt"
     requirements_path.write_text("colorama==0.3.9")
-    temp_repo_func.repo.index.add([str(requirements_path)])
-
     temp_repo_func.file_path.write_text(RETURN_COLORAMA_VERSION_FUNCTION)
-    temp_repo_func.repo.index.add([str(temp_repo_func.file_path)])
+
+    temp_repo_func.repo.index.add([str(requirements_path), str(temp_repo_func.file_path)])
     temp_repo_func.repo.index.commit("Added requirements")
 
     colorama_task = Task("test_file:return_str_function")
@@ -9,6 +9,9 @@ from arca.utils import logger
 from arca.exceptions import BuildError
 from common import BASE_DIR, RETURN_COLORAMA_VERSION_FUNCTION, SECOND_RETURN_STR_FUNCTION, TEST_UNICODE
 
+# the tests (un)install packages in the interpreter running them, which pytest-xdist workers share
+pytestmark = pytest.mark.xdist_group("current_environment")
+
 
 def _pip_action(action, package):
     if action not in ["install", "uninstall"]:
@@ -53,7 +56,7 @@ def test_current_environment_backend(temp_repo_func, requirements_location, file
     if file_location is not None:
         kwargs["cwd"] = file_location
 
-    backend = CurrentEnvironmentBackend(verbosity=2, **kwargs)
+    backend = CurrentEnvironmentBackend(**kwargs)
 
     arca = Arca(backend=backend, base_dir=BASE_DIR)
 
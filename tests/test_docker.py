@@ -1,63 +1,111 @@
-import os
 import platform
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
+import requests
 
 from arca import Arca, DockerBackend, Task
 from arca.exceptions import ArcaMisconfigured, PushToRegistryError, BuildError
 from common import (RETURN_COLORAMA_VERSION_FUNCTION, BASE_DIR, RETURN_PLATFORM,
-                    RETURN_PYTHON_VERSION_FUNCTION, RETURN_ALSAAUDIO_INSTALLED)
+                    RETURN_PYTHON_VERSION_FUNCTION, RETURN_ALSAAUDIO_INSTALLED, commit_files)
 
 
-TEST_REGISTRY = "docker.io/arcaoss/arca-test"
+@pytest.fixture(scope="session")
+def docker_client():
+    """ A single docker client shared by the backends in all tests.
+    """
+    docker = pytest.importorskip("docker")  # an optional dependency, the module must be collectable without it
+    client = docker.from_env()
 
+    yield client
 
-def test_keep_container_running(temp_repo_func):
-    backend = DockerBackend(verbosity=2, keep_container_running=True)
+    client.close()
+
+
+@pytest.fixture(scope="session")
+def local_registry(docker_client):
+    """ Runs a docker registry locally, so pushing and pulling images doesn't go over the network
+        and doesn't need credentials. Returns the repository name to be used as ``use_registry_name``.
+    """
+    container = docker_client.containers.run("registry:2", detach=True, ports={"5000/tcp": None})
+
+    try:
+        container.reload()  # the host port is assigned when the container starts
+        port = container.attrs["NetworkSettings"]["Ports"]["5000/tcp"][0]["HostPort"]
+
+        for _ in range(50):  # wait for the registry to start accepting connections
+            try:
+                requests.get(f"http://localhost:{port}/v2/", timeout=1)
+                break
+            except requests.exceptions.ConnectionError:
+                time.sleep(0.2)
+        else:
+            pytest.fail("The local docker registry didn't start")
+
+        yield f"localhost:{port}/arca-test"
+    finally:
+        container.remove(force=True)
+
+
+def test_keep_container_running(temp_repo_func, docker_client):
+    backend = DockerBackend(client=docker_client, keep_container_running=True)
 
     arca = Arca(backend=backend, base_dir=BASE_DIR)
 
     task = Task("test_file:return_str_function")
 
-    backend.check_docker_access()   # init docker client
+    assert arca.run(temp_repo_func.url, temp_repo_func.branch, task).output == "Some string"
 
-    container_count = len(backend.client.containers.list())
+    # only the container of this backend is checked, other tests can start and stop containers at the same time
+    assert len(backend._containers) == 1
+    container = next(iter(backend._containers))
+    assert backend.container_running(container.name) is not None
 
     assert arca.run(temp_repo_func.url, temp_repo_func.branch, task).output == "Some string"
 
-    count_after_run = len(backend.client.containers.list())
+    assert backend._containers == {container}  # the running container was reused
 
-    assert count_after_run == container_count + 1  # let's assume no changes are done to containers elsewhere
-    assert arca.run(temp_repo_func.url, temp_repo_func.branch, task).output == "Some string"
+    backend.stop_containers()
 
-    count_after_second_run = len(backend.client.containers.list())
+    assert not backend._containers
+    assert backend.container_running(container.name) is None
 
-    assert count_after_second_run == container_count + 1  # the count is still the same
 
-    backend.stop_containers()
+PYTHON_VERSIONS = ["3.6.0", platform.python_version()]
+
 
-    count_after_stop = len(backend.client.containers.list())
+@pytest.fixture(scope="module")
+def python_base_images(docker_client):
+    """ Gets the base images for all tested Python versions at once, so the pulls run concurrently.
+    """
+    def get_python_base(python_version):
+        backend = DockerBackend(client=docker_client, python_version=python_version)
+        Arca(backend=backend, base_dir=BASE_DIR)
+        backend.check_docker_access()
 
-    assert count_after_stop == container_count
+        return backend.get_python_base(python_version)
 
+    with ThreadPoolExecutor(len(PYTHON_VERSIONS)) as executor:
+        return list(executor.map(get_python_base, PYTHON_VERSIONS))
 
-@pytest.mark.parametrize("python_version", ["3.6.0", platform.python_version()])
-def test_python_version(temp_repo_func, python_version):
-    backend = DockerBackend(verbosity=2, python_version=python_version)
+
+@pytest.mark.parametrize("python_version", PYTHON_VERSIONS)
+def test_python_version(temp_repo_func, docker_client, python_base_images, python_version):
+    backend = DockerBackend(client=docker_client, python_version=python_version)
 
     arca = Arca(backend=backend, base_dir=BASE_DIR)
 
-    temp_repo_func.file_path.write_text(RETURN_PYTHON_VERSION_FUNCTION)
-    temp_repo_func.repo.index.add([str(temp_repo_func.file_path)])
-    temp_repo_func.repo.index.commit("Initial")
+    commit_files(temp_repo_func.repo, {temp_repo_func.file_path: RETURN_PYTHON_VERSION_FUNCTION}, "Initial")
 
     task = Task("test_file:return_python_version")
     assert arca.run(temp_repo_func.url, temp_repo_func.branch, task).output == python_version
 
 
-def test_apt_dependencies(temp_repo_func):
-    backend = DockerBackend(verbosity=2, apt_dependencies=["libasound2-dev"])
+@pytest.mark.slow
+def test_apt_dependencies(temp_repo_func, docker_client):
+    backend = DockerBackend(client=docker_client, apt_dependencies=["libasound2-dev"])
 
     arca = Arca(backend=backend, base_dir=BASE_DIR)
 
@@ -73,17 +121,16 @@ def test_apt_dependencies(temp_repo_func):
     assert arca.run(temp_repo_func.url, temp_repo_func.branch, task).output
 
 
-def test_inherit_image(temp_repo_func):
-    backend = DockerBackend(verbosity=2, inherit_image="mikicz/alpine-python-pipenv:latest")
+@pytest.mark.slow
+def test_inherit_image(temp_repo_func, docker_client):
+    backend = DockerBackend(client=docker_client, inherit_image="mikicz/alpine-python-pipenv:latest")
 
     arca = Arca(backend=backend, base_dir=BASE_DIR)
     task = Task("test_file:return_str_function")
 
     assert arca.run(temp_repo_func.url, temp_repo_func.branch, task).output == "Some string"
 
-    temp_repo_func.file_path.write_text(RETURN_PLATFORM)
-    temp_repo_func.repo.index.add([str(temp_repo_func.file_path)])
-    temp_repo_func.repo.index.commit("Platform")
+    commit_files(temp_repo_func.repo, {temp_repo_func.file_path: RETURN_PLATFORM}, "Platform")
 
     task = Task("test_file:return_platform")
 
@@ -124,25 +171,21 @@ def test_inherit_image(temp_repo_func):
     with pytest.raises(BuildError):  # Only Pipfile.lock
         arca.run(temp_repo_func.url, temp_repo_func.branch, colorama_task)
 
-    pipfile_path.write_text((Path(__file__).parent / "fixtures/Pipfile").read_text("utf-8"))
-
-    temp_repo_func.repo.index.add([str(pipfile_path)])
-    temp_repo_func.repo.index.commit("Added back Pipfile")
+    commit_files(temp_repo_func.repo, {
+        pipfile_path: (Path(__file__).parent / "fixtures/Pipfile").read_text("utf-8")
+    }, "Added back Pipfile")
 
     assert arca.run(temp_repo_func.url, temp_repo_func.branch, colorama_task).output == "0.3.9"
 
     # works even when requirements is in the repo
-    requirements_path.write_text("colorama==0.3.8")
-    temp_repo_func.repo.index.add([str(requirements_path)])
-    temp_repo_func.repo.index.commit("Added back requirements")
+    commit_files(temp_repo_func.repo, {requirements_path: "colorama==0.3.8"}, "Added back requirements")
 
     assert arca.run(temp_repo_func.url, temp_repo_func.branch, colorama_task).output == "0.3.9"
 
 
-@pytest.mark.skipif(os.environ.get("SKIP_PUSH_TEST", "false") == "true",
-                    reason="Encrypted variables not available in pull requests.")
-def test_push_to_registry(temp_repo_func, mocker):
-    backend = DockerBackend(verbosity=2, use_registry_name=TEST_REGISTRY)
+@pytest.mark.slow
+def test_push_to_registry(temp_repo_func, docker_client, local_registry, mocker):
+    backend = DockerBackend(client=docker_client, use_registry_name=local_registry)
     arca = Arca(backend=backend, base_dir=BASE_DIR)
 
     temp_repo_func.file_path.write_text(RETURN_COLORAMA_VERSION_FUNCTION)
@@ -173,13 +216,12 @@ def test_push_to_registry(temp_repo_func, mocker):
     mocker.patch.object(backend, "try_pull_image_from_registry", lambda *args: None)
 
     # untag the image so Arca thinks the images was just built and that it needs to be pushed
-    for image in backend.client.images.list(TEST_REGISTRY):
+    for image in backend.client.images.list(local_registry):
         for tag in image.tags:
-            if tag.startswith(TEST_REGISTRY):
+            if tag.startswith(local_registry):
                 backend.client.images.remove(tag)
 
-    backend = DockerBackend(verbosity=2, use_registry_name=TEST_REGISTRY,
-                            registry_pull_only=True)
+    backend = DockerBackend(client=docker_client, use_registry_name=local_registry, registry_pull_only=True)
     arca = Arca(backend=backend, base_dir=BASE_DIR)
 
     mocker.spy(backend, "push_to_registry")
@@ -188,9 +230,9 @@ def test_push_to_registry(temp_repo_func, mocker):
     assert backend.push_to_registry.call_count == 0
 
 
-def test_push_to_registry_fail(temp_repo_func):
+def test_push_to_registry_fail(temp_repo_func, docker_client):
     # when a unused repository name is used, it's created -> different username has to be used
-    backend = DockerBackend(verbosity=2, use_registry_name="docker.io/mikicz-unknown-user/arca-test")
+    backend = DockerBackend(client=docker_client, use_registry_name="docker.io/mikicz-unknown-user/arca-test")
     arca = Arca(backend=backend, base_dir=BASE_DIR)
 
     temp_repo_func.file_path.write_text(RETURN_COLORAMA_VERSION_FUNCTION)
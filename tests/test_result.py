@@ -1,4 +1,7 @@
 # encoding=utf-8
+import json
+import pickle
+
 import pytest
 
 from arca.exceptions import BuildError
@@ -24,3 +27,28 @@ def test_json():
 
     with pytest.raises(BuildError):
         Result("""{"success": false, "error": "Error" """)
+
+
+@pytest.mark.parametrize("result", [None, 1, [1, 2], "[1, 2]", b"1"])
+def test_invalid(result):
+    with pytest.raises(BuildError):
+        Result(result)
+
+
+@pytest.mark.parametrize("value", [
+    [1, 2.5, None, True],
+    float("inf"),
+    2 ** 70,
+    "片仮名",
+])
+def test_json_values(value):
+    assert Result(json.dumps({"success": True, "result": value})).output == value
+
+
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle(protocol):
+    res = pickle.loads(pickle.dumps(Result({"success": True, "result": "Message", "stdout": "Out"}), protocol))
+
+    assert res.output == "Message"
+    assert res.stdout == "Out"
+    assert res.stderr is None
@@ -6,7 +6,7 @@ import pytest
 
 import arca._runner as runner
 from arca import Task, Result, Arca, CurrentEnvironmentBackend
-from common import PRINTING_FUNCTION
+from common import BASE_DIR, PRINTING_FUNCTION, commit_files
 
 
 @pytest.mark.parametrize("definition", [
@@ -134,11 +134,9 @@ def test_unicode(mocker, args, kwargs, result):
 
 
 def test_output(temp_repo_func):
-    arca = Arca(backend=CurrentEnvironmentBackend)
+    arca = Arca(backend=CurrentEnvironmentBackend, base_dir=BASE_DIR)
 
-    temp_repo_func.file_path.write_text(PRINTING_FUNCTION)
-    temp_repo_func.repo.index.add([str(temp_repo_func.file_path)])
-    temp_repo_func.repo.index.commit("Initial")
+    commit_files(temp_repo_func.repo, {temp_repo_func.file_path: PRINTING_FUNCTION}, "Initial")
 
     result = arca.run(temp_repo_func.url, temp_repo_func.branch, Task("test_file:func"))
 
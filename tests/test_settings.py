@@ -15,6 +15,8 @@ def test_settings():
     assert settings.get("test_one", "test_two") == 1
     assert settings.get("test_two", "test_one") == 2
 
+    assert settings.get_key("test_one") == "ARCA_TEST_ONE"
+
     with pytest.raises(Exception):
         settings.get()
 
@@ -25,6 +27,14 @@ def test_settings():
         settings.get("test_non", "test_non_two")
 
 
+def test_settings_case_insensitive_keys():
+    settings = Settings({"arca_test_one": 1})
+    settings.set("Arca_Test_Two", 2)
+
+    assert settings.get("test_one") == 1
+    assert settings.get("TEST_TWO") == 2
+
+
 def test_setting_integration():
     arca = Arca(settings={
         "ARCA_BACKEND": "arca.backend.CurrentEnvironmentBackend",
@@ -36,6 +46,7 @@ def test_setting_integration():
     assert arca.backend.requirements_timeout == 500
     assert arca.backend.cwd == "test/"  # tests generic BACKEND settings
     assert arca.backend.requirements_location == "requirements.txt"  # tests default value
+    assert arca.backend.get_settings_keys("cwd") == ("current_environment_backend_cwd", "backend_cwd")
 
 
 def test_environ():
@@ -1,9 +1,9 @@
 from arca import Arca, Task, CurrentEnvironmentBackend
-from common import SECOND_RETURN_STR_FUNCTION, BASE_DIR, TEST_UNICODE
+from common import SECOND_RETURN_STR_FUNCTION, BASE_DIR, TEST_UNICODE, commit_files
 
 
 def test_single_pull(temp_repo_func, mocker):
-    backend = CurrentEnvironmentBackend(verbosity=2)
+    backend = CurrentEnvironmentBackend()
     arca = Arca(backend=backend, base_dir=BASE_DIR, single_pull=True)
 
     mocker.spy(arca, "_pull")
@@ -13,9 +13,7 @@ def test_single_pull(temp_repo_func, mocker):
     assert arca.run(temp_repo_func.url, temp_repo_func.branch, task).output == "Some string"
     assert arca._pull.call_count == 1
 
-    temp_repo_func.file_path.write_text(SECOND_RETURN_STR_FUNCTION)
-    temp_repo_func.repo.index.add([str(temp_repo_func.file_path)])
-    temp_repo_func.repo.index.commit("Updated function")
+    commit_files(temp_repo_func.repo, {temp_repo_func.file_path: SECOND_RETURN_STR_FUNCTION}, "Updated function")
 
     assert arca.run(temp_repo_func.url, temp_repo_func.branch, task).output == "Some string"
     assert arca._pull.call_count == 1
@@ -27,7 +25,7 @@ def test_single_pull(temp_repo_func, mocker):
 
 
 def test_pull_efficiency(temp_repo_func, mocker):
-    backend = CurrentEnvironmentBackend(verbosity=2)
+    backend = CurrentEnvironmentBackend()
     arca = Arca(backend=backend, base_dir=BASE_DIR)
 
     mocker.spy(arca, "_pull")
@@ -40,9 +38,7 @@ def test_pull_efficiency(temp_repo_func, mocker):
     assert arca.run(temp_repo_func.url, temp_repo_func.branch, task).output == "Some string"
     assert arca._pull.call_count == 2
 
-    temp_repo_func.file_path.write_text(SECOND_RETURN_STR_FUNCTION)
-    temp_repo_func.repo.index.add([str(temp_repo_func.file_path)])
-    temp_repo_func.repo.index.commit("Updated function")
+    commit_files(temp_repo_func.repo, {temp_repo_func.file_path: SECOND_RETURN_STR_FUNCTION}, "Updated function")
 
     assert arca.run(temp_repo_func.url, temp_repo_func.branch, task).output == TEST_UNICODE
     assert arca._pull.call_count == 3
@@ -30,6 +30,18 @@ def test_task_json(args, kwargs):
     assert task.hash
 
 
+@pytest.mark.parametrize(["args", "kwargs"], [
+    (None, None),
+    ([], {}),
+    (0, False),
+])
+def test_task_empty_arguments(args, kwargs):
+    task = Task("library.mod:func", args=args, kwargs=kwargs)
+
+    assert task.args == []
+    assert task.kwargs == {}
+
+
 @pytest.mark.parametrize("args", "kwargs", [
     (1, None),
     (None, 1),
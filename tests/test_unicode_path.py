@@ -3,7 +3,7 @@ from common import BASE_DIR
 
 
 def test_unicode_path(temp_repo_func,):
-    backend = CurrentEnvironmentBackend(verbosity=2)
+    backend = CurrentEnvironmentBackend()
     arca = Arca(backend=backend, base_dir=BASE_DIR + "/abčď", single_pull=True)
 
     task = Task("test_file:return_str_function")
@@ -1,6 +1,14 @@
+import copy
+import pickle
 from uuid import uuid4
 
-from arca.utils import is_dirty, get_last_commit_modifying_files, get_hash_for_file
+import pytest
+from git import Repo, GitCommandError
+
+from arca.backend import VenvBackend
+from arca.exceptions import ArcaMisconfigured
+from arca.utils import NOT_SET, NotSet, load_class, is_dirty, get_last_commit_modifying_files, get_hash_for_file
+from common import commit_files
 
 
 def test_is_dirty(temp_repo_static):
@@ -46,9 +54,35 @@ def test_get_last_commit_modifying_files(temp_repo_static):
 def test_get_hash_for_file(temp_repo_static):
     file_hash = get_hash_for_file(temp_repo_static.repo, temp_repo_static.file_path.name)
 
-    temp_repo_static.file_path.write_text(str(uuid4()))
-
-    temp_repo_static.repo.index.add([str(temp_repo_static.file_path)])
-    temp_repo_static.repo.index.commit("Updated")
+    commit_files(temp_repo_static.repo, {temp_repo_static.file_path: str(uuid4())}, "Updated")
 
     assert get_hash_for_file(temp_repo_static.repo, temp_repo_static.file_path.name) != file_hash
+
+    temp_repo_static.repo.head.reset("HEAD~1", index=True, working_tree=True)
+
+    assert get_hash_for_file(temp_repo_static.repo, temp_repo_static.file_path.name) == file_hash
+
+
+def test_get_hash_for_file_no_commits(tmp_path):
+    repo = Repo.init(str(tmp_path))
+
+    with pytest.raises(GitCommandError):
+        get_hash_for_file(repo, "file.txt")
+
+
+def test_load_class():
+    assert load_class("arca.backend.VenvBackend") is VenvBackend
+    assert load_class("arca.backend.VenvBackend") is VenvBackend
+    assert load_class.cache_info().hits >= 1
+
+    for _ in range(2):  # failures aren't cached
+        with pytest.raises(ArcaMisconfigured):
+            load_class("arca.backend.NonExistentBackend")
+
+
+def test_not_set():
+    assert NotSet() is NOT_SET
+    assert copy.deepcopy(NOT_SET) is NOT_SET
+
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        assert pickle.loads(pickle.dumps(NOT_SET, protocol)) is NOT_SET
@@ -10,7 +10,7 @@ except ImportError:
 from arca import VagrantBackend, Arca, Task
 from arca.exceptions import ArcaMisconfigured, BuildTimeoutError
 from common import BASE_DIR, RETURN_COLORAMA_VERSION_FUNCTION, SECOND_RETURN_STR_FUNCTION, TEST_UNICODE, \
-    WAITING_FUNCTION
+    WAITING_FUNCTION, commit_files
 
 
 TEST_REGISTRY = "docker.io/arcaoss/arca-test"
@@ -61,8 +61,7 @@ def test_validation():
 @pytest.mark.skipif(vagrant is None, reason="Vagrant not installed.")
 @pytest.mark.skipif(os.environ.get("TRAVIS", "false") == "true", reason="Vagrant doesn't work on Travis")
 def test_vagrant(temp_repo_func, destroy=False):
-    backend = VagrantBackend(verbosity=2, use_registry_name=TEST_REGISTRY,
-                             keep_vm_running=True)
+    backend = VagrantBackend(use_registry_name=TEST_REGISTRY, keep_vm_running=True)
     arca = Arca(backend=backend, base_dir=BASE_DIR)
 
     if destroy:
@@ -82,9 +81,8 @@ def test_vagrant(temp_repo_func, destroy=False):
     # branch branch - return unicode
     temp_repo_func.repo.create_head("branch")
     temp_repo_func.repo.branches.branch.checkout()
-    temp_repo_func.file_path.write_text(SECOND_RETURN_STR_FUNCTION)
-    temp_repo_func.repo.index.add([str(temp_repo_func.file_path)])
-    temp_repo_func.repo.index.commit("Test unicode on a separate branch")
+    commit_files(temp_repo_func.repo, {temp_repo_func.file_path: SECOND_RETURN_STR_FUNCTION},
+                 "Test unicode on a separate branch")
 
     task = Task("test_file:return_str_function")
 
@@ -96,8 +94,7 @@ def test_vagrant(temp_repo_func, destroy=False):
 
     # halt the vm and create a new instance of the backend, to check that the vagrant attribute can be set from existing
     backend.stop_vm()
-    backend = VagrantBackend(verbosity=2, use_registry_name=TEST_REGISTRY,
-                             keep_vm_running=True)
+    backend = VagrantBackend(use_registry_name=TEST_REGISTRY, keep_vm_running=True)
     arca = Arca(backend=backend, base_dir=BASE_DIR)
     assert arca.run(temp_repo_func.url, temp_repo_func.branch, task).output == "0.3.9"
 
@@ -107,9 +104,7 @@ def test_vagrant(temp_repo_func, destroy=False):
 
     # test timeout
     temp_repo_func.repo.branches[temp_repo_func.branch].checkout()
-    temp_repo_func.file_path.write_text(WAITING_FUNCTION)
-    temp_repo_func.repo.index.add([str(temp_repo_func.file_path)])
-    temp_repo_func.repo.index.commit("Waiting function")
+    commit_files(temp_repo_func.repo, {temp_repo_func.file_path: WAITING_FUNCTION}, "Waiting function")
 
     task_1_second = Task("test_file:return_str_function", timeout=1)
     task_3_seconds = Task("test_file:return_str_function", timeout=3)